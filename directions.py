@@ -5,19 +5,51 @@
 Get driving directions and times from Google.
 """
 
-from __future__ import print_function, unicode_literals
-import requests
+import orjson
 import logging
 import argparse
-import os
+import calendar
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pytz
-try:
-    import configparser
-except ImportError:
-    import ConfigParser as configparser
+from urllib.parse import quote, urlencode
+from zoneinfo import ZoneInfo
 
-import geopy
+import timezonefinder
+
+from driving_forecast.config import Configuration
+from driving_forecast.geocoding import Coordinates
+from driving_forecast.http import get_client
+
+# Offline coordinate-to-time-zone resolver; answers from a bundled
+# shapefile in microseconds instead of an HTTPS round-trip.
+_TZ_FINDER = timezonefinder.TimezoneFinder()
+
+
+@functools.lru_cache(maxsize=1024)
+def _time_zone_id(latitude, longitude, timestamp, api_key, base_url):
+    """
+    Look up the time zone ID for a coordinate pair through the google time
+    zone api. Callers should round the coordinates so nearby points share a
+    cache entry; time zone boundaries are far coarser than street addresses.
+
+    :param latitude: latitude rounded to ~3 decimal places
+    :type latitude: float
+    :param longitude: longitude rounded to ~3 decimal places
+    :type longitude: float
+    :param timestamp: epoch seconds of the moment being resolved
+    :type timestamp: int
+    :param api_key: google time zone api key
+    :type api_key: str or unicode
+    :param base_url: google time zone base url
+    :type base_url: str or unicode
+    :return: time zone ID
+    """
+    query = urlencode({'location': f"{latitude},{longitude}",
+                       'timestamp': timestamp, 'key': api_key})
+    request = get_client().get(base_url + query)
+    response = orjson.loads(request.content)
+    return response['timeZoneId']
 
 
 class GoogleDirections:
@@ -25,6 +57,10 @@ class GoogleDirections:
     Get driving directions using google maps api.
     """
 
+    __slots__ = ('origin', 'destination', 'maps_api_key', 'base_url',
+                 'alternatives', 'departure_time', 'time_zone_api_key',
+                 '_static_qs')
+
     def __init__(self, origin, destination, maps_api_key,
                  time_zone_api_key, alternatives="true",
                  departure_time="now",
@@ -57,6 +93,9 @@ class GoogleDirections:
         self.alternatives = alternatives
         self.departure_time = departure_time
         self.time_zone_api_key = time_zone_api_key
+        # these parameters never change between queries, so encode them once
+        self._static_qs = urlencode({'alternatives': alternatives,
+                                     'key': maps_api_key})
 
     def epoch_time(self, origin):
         """
@@ -66,19 +105,23 @@ class GoogleDirections:
         :param origin: lat/long coordinate for start location
         :type origin: str or unicode
         :return: epoch time as a str of an int
+        :raises ValueError: if the departure time is in the past for the
+        start location's time zone.
         """
-        # TODO: compare specified time to current time in start city. warn if
-        # in past. Google api returns appropriate error, but better to save a
-        #  query and check it locally if possible.
         if self.departure_time != "now":
             current_timestamp = LocalTime(
                 api_key=self.time_zone_api_key,
                 date=self.departure_time, coordinates=origin)
 
             tz = current_timestamp.tz
-            dt_with_tz = tz.localize(self.departure_time, is_dst=None)
-            ts = (dt_with_tz - datetime(1970, 1, 1,
-                                         tzinfo=pytz.utc)).total_seconds()
+            dt_with_tz = self.departure_time.replace(tzinfo=tz)
+            # the time zone lookup is offline now, so checking locally is
+            # free and saves a doomed directions api query.
+            if dt_with_tz < datetime.now(tz):
+                raise ValueError(
+                    "departure_time {} is in the past for the start "
+                    "location".format(self.departure_time))
+            ts = dt_with_tz.timestamp()
             return str(int(ts))
         else:
             return self.departure_time
@@ -97,11 +140,11 @@ class GoogleDirections:
         :type epoch_start_time: str or unicode
         :return: json response
         """
-        params = {'origin': start, 'destination': stop, 'alternatives':
-            self.alternatives, 'departure_time': epoch_start_time,
-                  'key': self.maps_api_key}
-        request = requests.get(self.base_url, params=params)
-        return request.json()
+        url = (f"{self.base_url}origin={quote(start)}"
+               f"&destination={quote(stop)}"
+               f"&departure_time={epoch_start_time}&{self._static_qs}")
+        request = get_client().get(url)
+        return orjson.loads(request.content)
 
     def get_coordinates(self, address):
         """
@@ -122,8 +165,13 @@ class GoogleDirections:
 
         :return: route data in json format
         """
-        start = self.get_coordinates(self.origin)
-        end = self.get_coordinates(self.destination)
+        # origin and destination geocodes are independent, so resolve them
+        # in parallel and pay only the slower of the two round-trips.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            start_job = executor.submit(self.get_coordinates, self.origin)
+            end_job = executor.submit(self.get_coordinates, self.destination)
+            start = start_job.result()
+            end = end_job.result()
         logging.info("Start location: {}".format(start[0]))
         logging.info("End location: {}".format(end[0]))
         start = "{},{}".format(start[1], start[2])
@@ -133,10 +181,53 @@ class GoogleDirections:
         return response
 
 
+class RouteMatrix:
+    """
+    Get travel times and distances between many waypoints in one request
+    using the OSRM table service. For n points along a route this is a
+    single HTTP call returning the full n-by-n matrix, instead of a
+    separate route query per pair.
+    """
+
+    __slots__ = ('coordinates', 'base_url')
+
+    def __init__(self, coordinates,
+                 base_url="https://router.project-osrm.org/table/v1"
+                          "/driving/"):
+        """
+        :param coordinates: (latitude, longitude) pair for each waypoint
+        :type coordinates: list of tuple
+        :param base_url: osrm table service base url
+        :type base_url: str
+        """
+        # osrm expects longitude,latitude order; join the list once since
+        # it is reused verbatim for every query.
+        self.coordinates = ";".join(
+            f"{longitude},{latitude}" for latitude, longitude in coordinates)
+        self.base_url = base_url
+
+    def query(self, annotations="duration,distance"):
+        """
+        Retrieve the waypoint-by-waypoint matrix from osrm.
+
+        :param annotations: which matrices osrm should compute
+        :type annotations: str
+        :return: json response; 'durations' is a matrix of seconds and
+        'distances' a matrix of meters, indexed by waypoint order.
+        """
+        url = f"{self.base_url}{self.coordinates}?annotations={annotations}"
+        request = get_client().get(url)
+        return orjson.loads(request.content)
+
+
 class LocalTime:
     """
     Get current date and time in the start location's local time.
     """
+
+    __slots__ = ('base_url', 'date', 'coordinates', 'api_key',
+                 'local_date_time', 'tz')
+
     def __init__(self, date, coordinates, api_key,
         base_url="https://maps.googleapis.com/maps/api"
                                  "/timezone/json?"):
@@ -151,22 +242,27 @@ class LocalTime:
         :type base_url: str or unicode
         """
         self.base_url = base_url
-        self.date = (date - datetime(1970,1,1)).total_seconds()
+        self.date = calendar.timegm(date.utctimetuple())
         self.coordinates = coordinates
         self.api_key = api_key
         self.local_date_time, self.tz = self.current_date_time()
 
     def time_zone(self):
         """
-        Use google time zone api to get the time zone from the start location.
+        Resolve the start location's time zone offline with timezonefinder,
+        falling back to the google time zone api for the rare coordinates
+        (open ocean) the bundled shapefile cannot place.
 
         :return: time zone ID
         """
-        params = {'location': self.coordinates, 'timestamp': self.date,
-                  'key': self.api_key}
-        request = requests.get(self.base_url, params=params)
-        response = request.json()
-        time_zone = response['timeZoneId']
+        latitude, longitude = self.coordinates.split(',')
+        time_zone = _TZ_FINDER.timezone_at(lat=float(latitude),
+                                           lng=float(longitude))
+        if time_zone is None:
+            time_zone = _time_zone_id(round(float(latitude), 3),
+                                      round(float(longitude), 3),
+                                      self.date, self.api_key,
+                                      self.base_url)
         return time_zone
 
     def current_date_time(self):
@@ -175,94 +271,40 @@ class LocalTime:
 
         :return: local date time stamp from now and the time zone instance.
         """
-        tz = pytz.timezone(self.time_zone())
+        tz = ZoneInfo(self.time_zone())
         local_date_time = datetime.now(tz)
         return local_date_time, tz
 
-class Coordinates:
+def get_route(origin, destination, maps_api_key, time_zone_api_key,
+              departure_time="now", backend="google"):
     """
-    Get the coordinates of a given address using Google Maps through geopy.
+    Resolve driving directions through the selected backend. Google is
+    the only routing backend in this tree, so callers depend on this one
+    symbol and the dispatch gains a branch only if another backend is
+    ever added.
+
+    :param origin: street address start point
+    :type origin: str
+    :param destination: street address end point
+    :type destination: str
+    :param maps_api_key: google maps api key
+    :type maps_api_key: str
+    :param time_zone_api_key: google maps time zone api key
+    :type time_zone_api_key: str
+    :param departure_time: departure time from origin, or "now"
+    :type departure_time: datetime.datetime()
+    :param backend: which routing service to use; only "google"
+    :type backend: str
+    :return: route data in json format
+    :raises ValueError: for an unknown backend.
     """
-
-    def __init__(self, address):
-        """
-        :param address: street address
-        :type address: str
-        """
-        self.address = address
-
-    def location(self):
-        """
-        Get the resolved address and coordinates for a given street address
-        using Google maps through geopy.
-
-        :return: tuple of location name, latitude, longitude
-        """
-        geolocator = geopy.geocoders.GoogleV3()
-        location = geolocator.geocode(self.address)
-        return [location, location.latitude, location.longitude]
-
-
-class Configuration:
-    """
-    Read in api keys from the configuration file.
-    """
-
-    def __init__(self, config_file='development/config.ini'):
-        """
-        Constructor.
-
-        :param config_file: path to the configuration file.
-        :type config_file: str or unicode
-        """
-        self.config_file = config_file
-        self.google_maps_api_key, self.google_time_zone_api_key = \
-            self.parse_config()
-
-
-    def read_config(self):
-        """
-        Check for existence of the development directory and configuration
-        file. Read it in if so.
-
-        :return: configparser.ConfigParser() object
-        """
-        config = configparser.ConfigParser()
-        if os.path.isfile(os.path.abspath(self.config_file)):
-            config.read(self.config_file)
-        else:
-            raise Exception("Create a 'development' directory and copy "
-                            "'config.ini' into it and fill in the values.")
-        return config
-
-    def parse_config(self):
-        """
-        Get the relevant values from the configuration file.
-
-        :return: the google api key
-        """
-        maps_api_key = ""
-        time_zone_api_key = ""
-        config = self.read_config()
-        if config.has_section('google'):
-            if config.has_option('google', 'maps_api_key'):
-                maps_api_key = config.get('google', 'maps_api_key').strip()
-            else:
-                logging.error("Malformed configuration file. No option in "
-                              "'google' for 'maps_api_key'")
-            if config.has_option('google', 'time_zone_api_key'):
-                time_zone_api_key = config.get('google',
-                                            'time_zone_api_key').strip()
-            else:
-                logging.error("Malformed configuration file. No option in "
-                              "'google' for 'time_zone_api_key'")
-        else:
-            logging.error("Malformed configuration file. No section 'google'.")
-        if maps_api_key and time_zone_api_key:
-            return maps_api_key, time_zone_api_key
-        else:
-            raise Exception("Missing value for google api key(s).")
-
+    if backend != "google":
+        raise ValueError("Unknown directions backend: {}".format(backend))
+    directions = GoogleDirections(
+        origin=origin, destination=destination,
+        maps_api_key=maps_api_key, time_zone_api_key=time_zone_api_key,
+        departure_time=departure_time)
+    return directions.run()
 
 
 def cli():
@@ -296,11 +338,11 @@ if __name__=="__main__":
         level=logging.DEBUG,
         format='%(asctime)s %(levelname)s %(message)s')
 
-    api_key = Configuration()
+    api_key = Configuration(required=('google_maps_api_key',
+                                      'google_time_zone_api_key'))
 
-    y = GoogleDirections(origin=arguments.origin,
-                         destination=arguments.destination,
-                         departure_time=arguments.departure_date_time,
-                         maps_api_key=api_key.google_maps_api_key,
-                         time_zone_api_key=api_key.google_time_zone_api_key)
-    print(y.run())
\ No newline at end of file
+    print(get_route(origin=arguments.origin,
+                    destination=arguments.destination,
+                    departure_time=arguments.departure_date_time,
+                    maps_api_key=api_key.google_maps_api_key,
+                    time_zone_api_key=api_key.google_time_zone_api_key))
\ No newline at end of file
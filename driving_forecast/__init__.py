@@ -0,0 +1,6 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Shared building blocks for the driving weather forecast tools.
+"""
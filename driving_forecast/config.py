@@ -0,0 +1,125 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Read api keys from the configuration file. Shared by every tool in this
+project so the file is parsed once no matter who asks.
+"""
+
+import configparser
+import functools
+import logging
+import os
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+
+@functools.lru_cache(maxsize=4)
+def _read_config(config_file):
+    """
+    Read and parse a configuration file, caching the result so repeated
+    Configuration instances share one disk read and parse per path. A
+    '.toml' file is parsed with the stdlib tomllib (python 3.11+);
+    anything else goes through configparser. Either way the values are
+    returned in a ConfigParser so callers need not care.
+
+    :param config_file: absolute path to the configuration file.
+    :type config_file: str
+    :return: configparser.ConfigParser() object
+    """
+    config = configparser.ConfigParser()
+    if not os.path.isfile(config_file):
+        raise Exception("Create a 'development' directory and copy "
+                        "'config.ini' into it and fill in the values.")
+    if config_file.endswith('.toml'):
+        if tomllib is None:
+            raise Exception("Reading a '.toml' configuration file requires "
+                            "python 3.11+ for tomllib. Use the '.ini' "
+                            "format on older versions.")
+        with open(config_file, 'rb') as handle:
+            config.read_dict(tomllib.load(handle))
+    else:
+        config.read(config_file)
+    return config
+
+
+class Configuration:
+    """
+    Read in api keys from the configuration file.
+    """
+
+    __slots__ = ('config_file', 'google_maps_api_key',
+                 'google_time_zone_api_key', 'weather_api_key')
+
+    def __init__(self, config_file='development/config.ini', required=()):
+        """
+        Constructor.
+
+        :param config_file: path to the configuration file.
+        :type config_file: str
+        :param required: attribute names ('google_maps_api_key',
+        'google_time_zone_api_key', 'weather_api_key') that must be
+        non-empty; callers list the keys their service needs so a missing
+        value fails here instead of in a remote api error later.
+        :type required: tuple of str
+        :raises Exception: if a required key has no value.
+        """
+        self.config_file = config_file
+        (self.google_maps_api_key, self.google_time_zone_api_key,
+         self.weather_api_key) = self.parse_config()
+        for name in required:
+            if not getattr(self, name):
+                raise Exception("Missing value for '{}' in the "
+                                "configuration file.".format(name))
+
+    def read_config(self):
+        """
+        Check for existence of the development directory and configuration
+        file. Read it in if so. Delegates to the cached module-level reader
+        so the file is parsed at most once per process.
+
+        :return: configparser.ConfigParser() object
+        """
+        return _read_config(os.path.abspath(self.config_file))
+
+    def parse_config(self):
+        """
+        Get the relevant values from the configuration file. A key missing
+        from the file is logged and returned as an empty string, so one
+        tool can run with only its own service configured.
+
+        :return: tuple of google maps, google time zone, and dark sky api
+        keys.
+        """
+        config = self.read_config()
+        keys = (self._get_key(config, 'google', 'maps_api_key'),
+                self._get_key(config, 'google', 'time_zone_api_key'),
+                self._get_key(config, 'dark_sky', 'weather_api_key'))
+        if not any(keys):
+            raise Exception("Missing value for api key(s).")
+        return keys
+
+    @staticmethod
+    def _get_key(config, section, option):
+        """
+        Fetch a single key, logging what is missing rather than raising.
+
+        :param config: parsed configuration
+        :type config: configparser.ConfigParser()
+        :param section: section name in the configuration file
+        :type section: str
+        :param option: option name within the section
+        :type option: str
+        :return: the key value, or an empty string if absent.
+        """
+        if not config.has_section(section):
+            logging.error("Malformed configuration file. No section "
+                          "'{}'.".format(section))
+            return ""
+        if not config.has_option(section, option):
+            logging.error("Malformed configuration file. No option in "
+                          "'{}' for '{}'".format(section, option))
+            return ""
+        return config.get(section, option).strip()
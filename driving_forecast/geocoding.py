@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resolve street addresses to coordinates. Shared by every tool in this
+project so they all go through one geolocator and one cache.
+"""
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import geopy
+
+from driving_forecast.config import Configuration
+
+_GEOLOCATOR = None
+
+
+def _get_geolocator():
+    """
+    Return the shared geolocator, building it on first use with the
+    configured google maps api key. One instance serves every geocode so
+    they reuse one client and its connection pool, and deferring
+    construction means a missing key fails at geocode time with a clear
+    error instead of at import time.
+
+    :return: geopy.geocoders.GoogleV3 instance
+    """
+    global _GEOLOCATOR
+    if _GEOLOCATOR is None:
+        config = Configuration(required=('google_maps_api_key',))
+        _GEOLOCATOR = geopy.geocoders.GoogleV3(
+            api_key=config.google_maps_api_key, timeout=10)
+    return _GEOLOCATOR
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve(address):
+    """
+    Resolve a street address to its location and coordinates, caching the
+    result so a repeated address costs a dict lookup instead of an HTTPS
+    round-trip.
+
+    :param address: street address
+    :type address: str
+    :return: tuple of location name, latitude, longitude
+    """
+    location = _get_geolocator().geocode(address)
+    return location, location.latitude, location.longitude
+
+
+def resolve_many(addresses, max_workers=10):
+    """
+    Resolve many street addresses concurrently. The lookups fan out across
+    a bounded worker pool, so n geocodes finish in roughly one round-trip
+    window instead of n, and repeated addresses are served from the shared
+    cache.
+
+    :param addresses: street addresses to resolve
+    :type addresses: list of str
+    :param max_workers: cap on concurrent geocode requests
+    :type max_workers: int
+    :return: list of (location name, latitude, longitude) tuples in the
+    same order as the given addresses
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(resolve, addresses))
+
+
+class Coordinates:
+    """
+    Get the coordinates of a given address using Google Maps through geopy.
+    """
+
+    __slots__ = ('address',)
+
+    def __init__(self, address):
+        """
+        :param address: street address
+        :type address: str
+        """
+        self.address = address
+
+    def location(self):
+        """
+        Get the resolved address and coordinates for a given street address
+        using Google maps through geopy. Repeated addresses are served from
+        the module-level cache.
+
+        :return: tuple of location name, latitude, longitude
+        """
+        return resolve(self.address)
+
+    @classmethod
+    def resolve_many(cls, addresses, max_workers=10):
+        """
+        Resolve many street addresses concurrently. See
+        :func:`resolve_many`.
+
+        :param addresses: street addresses to resolve
+        :type addresses: list of str
+        :param max_workers: cap on concurrent geocode requests
+        :type max_workers: int
+        :return: list of (location name, latitude, longitude) tuples in the
+        same order as the given addresses
+        """
+        return resolve_many(addresses, max_workers=max_workers)
@@ -0,0 +1,35 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+One HTTP client for every api this project talks to. The directions,
+time zone, forecast, and osrm calls all draw from a single bounded
+connection pool instead of each module keeping its own.
+"""
+
+import atexit
+
+import httpx
+
+_CLIENT = None
+
+
+def get_client():
+    """
+    Return the process-wide httpx client, creating it on first use. The
+    client multiplexes over HTTP/2 with a bounded per-host keep-alive
+    pool and puts a hard timeout on every request; it is closed at
+    interpreter exit.
+
+    :return: httpx.Client
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            transport=httpx.HTTPTransport(
+                http2=True, retries=3,
+                limits=httpx.Limits(max_connections=16,
+                                    max_keepalive_connections=8)))
+        atexit.register(_CLIENT.close)
+    return _CLIENT
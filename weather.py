@@ -5,15 +5,12 @@
 Get weather forecast at specific time and place.
 """
 
-from __future__ import print_function, unicode_literals
-import os
 import logging
-import requests
+import orjson
 import argparse
-try:
-    import configparser
-except ImportError:
-    import ConfigParser as configparser
+
+from driving_forecast.config import Configuration
+from driving_forecast.http import get_client
 
 
 class Forecast:
@@ -22,6 +19,12 @@ class Forecast:
     https://api.darksky.net/forecast/[key]/[latitude],[longitude]
     """
 
+    __slots__ = ('latitude', 'longitude', 'api_key', 'base_url', 'extend')
+
+    # query-string fragments precomputed at class level so __init__ is a
+    # branch-free lookup even when instantiated per route point.
+    _EXTEND = {True: "?extend=hourly", False: ""}
+
     def __init__(self, latitude, longitude, api_key,
                  base_url="https://api.darksky.net/forecast", extend=True):
         """
@@ -42,77 +45,18 @@ class Forecast:
         self.longitude = longitude
         self.api_key = api_key
         self.base_url = base_url
-        if extend:
-            self.extend="?extend=hourly"
-        else:
-            self.extend=""
+        self.extend = Forecast._EXTEND[bool(extend)]
 
     def query(self):
         """
         Construct API call url and get back results.
         :return: weather forecast in json format.
         """
-        url = "{base_url}/{api_key}/{latitude},{longitude}{extend_option}"
-        url = url.format(base_url=self.base_url, api_key=self.api_key,
-        latitude=self.latitude, longitude=self.longitude,
-                         extend_option=self.extend)
-        request = requests.get(url)
-        return request.json()
-
-
-class Configuration:
-    """
-    Read in api keys from the configuration file.
-    """
-
-    def __init__(self, config_file='development/config.ini'):
-        """
-        Constructor.
-
-        :param config_file: path to the configuration file.
-        :type config_file: str or unicode
-        """
-        self.config_file = config_file
-        self.weather_api_key = self.parse_config()
-
-
-    def read_config(self):
-        """
-        Check for existence of the development directory and configuration
-        file. Read it in if so.
+        url = (f"{self.base_url}/{self.api_key}/"
+               f"{self.latitude},{self.longitude}{self.extend}")
+        request = get_client().get(url)
+        return orjson.loads(request.content)
 
-        :return: configparser.ConfigParser() object
-        """
-        config = configparser.ConfigParser()
-        if os.path.isfile(os.path.abspath(self.config_file)):
-            config.read(self.config_file)
-        else:
-            raise Exception("Create a 'development' directory and copy "
-                            "'config.ini' into it and fill in the values.")
-        return config
-
-    def parse_config(self):
-        """
-        Get the relevant values from the configuration file.
-
-        :return: the google api key
-        """
-        weather_api_key = ""
-        config = self.read_config()
-        if config.has_section('dark_sky'):
-            if config.has_option('dark_sky', 'weather_api_key'):
-                weather_api_key = config.get('dark_sky',
-                                             'weather_api_key').strip()
-            else:
-                logging.error("Malformed configuration file. No option in "
-                              "'dark_sky' for 'weather_api_key'")
-        else:
-            logging.error("Malformed configuration file. No section "
-                          "'dark_sky'.")
-        if weather_api_key:
-            return weather_api_key
-        else:
-            raise Exception("Missing value for dark_sky api key(s).")
 
 def cli():
     """
@@ -133,7 +77,7 @@ if __name__=="__main__":
     logging.basicConfig(
         level=logging.DEBUG,
         format='%(asctime)s %(levelname)s %(message)s')
-    config = Configuration()
+    config = Configuration(required=('weather_api_key',))
     forecast = Forecast(
         latitude=args.latitude,
         longitude=args.longitude,